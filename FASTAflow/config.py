@@ -1,6 +1,16 @@
 import os
 from pathlib import Path
 
+from sqlalchemy.engine import make_url
+
+
+def _is_memory_database(uri):
+    """Checks if a database URI points to an in-memory SQLite database."""
+    url = make_url(uri)
+    return (url.get_backend_name() == 'sqlite'
+            and (url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'))
+
+
 class Config:
     """Basic configuration"""
     # Get the project root
@@ -12,13 +22,18 @@ class Config:
     SQLALCHEMY_DATABASE_URI = f'sqlite:///{DATABASE_DIR / DATABASE_NAME}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-    # File uploads
-    UPLOAD_DIR = PROJECT_ROOT / 'temp'
+    # Check and recycle pooled connections, these options are accepted by every connection pool
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,  # Replace connections the database has dropped
+        'pool_recycle': 3600,
+    }
+
+    # File uploads, parsed in memory so the size limit also bounds memory use
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
-    ALLOWED_EXTENSIONS = {'fasta', 'fas', 'fa', 'fna', 'ffn', 'faa', 'mpfa', 'frn'}
+    ALLOWED_EXTENSIONS = frozenset({'fasta', 'fas', 'fa', 'fna', 'ffn', 'faa', 'mpfa', 'frn'})
 
-    # Security
-    SECRET_KEY = 'z\x16_\x0f\xe2N\xdd\x83^\x07!<'  # In production, load from environment
+    # Security, read once at import so every worker and restart signs sessions with the same key
+    SECRET_KEY = os.getenv('FLASK_SECRET_KEY')
 
 
 class DevelopmentConfig(Config):
@@ -26,16 +41,25 @@ class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_ECHO = True  # Log SQL queries
 
+    # Fixed fallback so local sessions survive restarts, never used in production
+    SECRET_KEY = Config.SECRET_KEY or 'fastaflow-development-key'
+
 
 class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
 
-    # In production, load secret key from environment
-    SECRET_KEY = os.getenv('FLASK_SECRET_KEY', Config.SECRET_KEY)
-
     # Use environment variable for database in production
     SQLALCHEMY_DATABASE_URI = os.getenv(
         'DATABASE_URL',
         Config.SQLALCHEMY_DATABASE_URI
-    )
\ No newline at end of file
+    )
+
+    # Keep more connections open for concurrent requests, an in-memory database has a single
+    # connection pool that doesn't take a size
+    if not _is_memory_database(SQLALCHEMY_DATABASE_URI):
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            **Config.SQLALCHEMY_ENGINE_OPTIONS,
+            'pool_size': 10,
+            'max_overflow': 20,
+        }
\ No newline at end of file
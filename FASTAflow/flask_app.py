@@ -27,6 +27,7 @@ def create_app(config_object=None):
 
     Raises:
         OSError: If database directory creation fails.
+        RuntimeError: If no secret key is configured.
     """
     app = Flask(__name__, static_folder='static')
 
@@ -35,9 +36,12 @@ def create_app(config_object=None):
         config_object = ProductionConfig if os.getenv('FLASK_ENV') == 'production' else DevelopmentConfig
     app.config.from_object(config_object)
 
-    # Make sure the required directories exist
+    # Refuse to start with a missing key, a random fallback would log users out on every restart
+    if not app.config['SECRET_KEY']:
+        raise RuntimeError('No secret key configured, set the FLASK_SECRET_KEY environment variable')
+
+    # Make sure the database directory exists
     Path(app.config['DATABASE_DIR']).mkdir(parents=True, exist_ok=True)
-    Path(app.config['UPLOAD_DIR']).mkdir(parents=True, exist_ok=True)
 
     # Initialize extensions
     db.init_app(app)
@@ -54,10 +58,10 @@ def create_app(config_object=None):
     def inject_version():
         return dict(version=__version__)
 
-    # Initialize database
+    # Initialize database, resetting it only on explicit request in development
     with app.app_context():
-        if app.config['DEBUG']:
-            db.drop_all()  # Only in development
+        if app.config['DEBUG'] and os.getenv('FASTAFLOW_RESET_DB'):
+            db.drop_all()
         db.create_all()
         app.logger.info(f"Database initialized at {app.config['SQLALCHEMY_DATABASE_URI']}")
 
@@ -5,14 +5,64 @@ The main class `FastaEntry` represents individual FASTA sequences with relevant
 enabling storage and retrieval of sequence data and analysis results. It includes attributes like 
 sequence length, GC content, nucleotide frequencies, and more.
 
+Every new SQLite connection is tuned with a few PRAGMAs, so commits append to a
+write-ahead log instead of syncing the whole database and reads are served from
+a larger page cache and memory-mapped pages.
+
 Classes:
+    JSONEncodedDict: A column type storing dictionaries as JSON text.
     FastaEntry: A SQLAlchemy model for storing and managing sequence data and results.
 """
+import json
+import sqlite3
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.types import TypeDecorator
 
 # Creates db object for the database connection
 db = SQLAlchemy()
 
+# Shared JSON encoder and decoder for the JSON columns, the encoder writes without whitespace
+_json_encoder = json.JSONEncoder(separators=(',', ':'))
+_json_decoder = json.JSONDecoder()
+
+
+@event.listens_for(Engine, 'connect')
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Applies the performance PRAGMAs to every new SQLite connection."""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA cache_size=-65536')  # 64MB page cache
+    cursor.execute('PRAGMA mmap_size=268435456')  # 256MB memory-mapped I/O
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.close()
+
+
+class JSONEncodedDict(TypeDecorator):
+    """
+    Stores a dictionary as JSON text. Decoding JSON is much cheaper than unpickling
+    and, unlike pickle, can't run arbitrary code when a row is loaded.
+
+    Values pickled by the previous `PickleType` columns are cleared by the database
+    migration. Anything else that isn't text is read back as None, so the entry is
+    simply analyzed again.
+    """
+    impl = db.Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return _json_encoder.encode(value) if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return _json_decoder.decode(value) if isinstance(value, str) else None
+
+
 class FastaEntry(db.Model):
     """
     Represents a FASTA file entry containing metadata and sequence information.
@@ -31,24 +81,28 @@ class FastaEntry(db.Model):
     :type description: str
     :ivar sequence: The nucleotide sequence in the FASTA entry.
     :type sequence: str
-    :ivar filepath: Path to the file where the FASTA sequence is stored.
+    :ivar filepath: Name of the uploaded FASTA file the sequence was read from.
     :type filepath: str
     :ivar sequence_length: Length of the nucleotide sequence.
     :type sequence_length: int
     :ivar gc_content: The calculated GC content (percentage of G and C bases in
         the sequence).
     :type gc_content: float
-    :ivar nuc_freq: Nucleotide frequency data stored as a serialized object.
+    :ivar nuc_freq: Nucleotide frequency data stored as JSON.
         Typically, a dictionary where keys are nucleotides ('A', 'T', 'C', 'G')
         and values are their occurrence counts.
     :type nuc_freq: dict
-    :ivar codon_freq: Codon frequency data stored as a serialized object.
+    :ivar codon_freq: Codon frequency data stored as JSON.
         Typically, a dictionary where keys are codons (triplets of nucleotides)
         and values are their occurrence counts.
     :type codon_freq: dict
     :ivar protein_seq: Translated protein sequence corresponding to the FASTA
         nucleotide sequence, if applicable.
     :type protein_seq: str
+    :ivar amino_freq: Amino acid frequency data of the protein sequence stored as
+        JSON. A dictionary where keys are amino acids and values are their
+        frequencies in percentage.
+    :type amino_freq: dict
     :ivar upload_date: Timestamp indicating when the FASTA entry was uploaded
         to the system.
     :type upload_date: datetime
@@ -60,9 +114,10 @@ class FastaEntry(db.Model):
     filepath = db.Column(db.String(500), nullable=False)
     sequence_length = db.Column(db.Integer)
     gc_content = db.Column(db.Float)
-    nuc_freq = db.Column(db.PickleType)
-    codon_freq = db.Column(db.PickleType)
+    nuc_freq = db.Column(JSONEncodedDict)
+    codon_freq = db.Column(JSONEncodedDict)
     protein_seq = db.Column(db.Text)
+    amino_freq = db.Column(JSONEncodedDict)
     upload_date = db.Column(db.DateTime, default=db.func.current_timestamp())
 
     def __repr__(self):
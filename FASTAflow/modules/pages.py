@@ -6,10 +6,12 @@ processing data, and generating results/plots. It interacts with a database to s
 fasta file contents and computes various analyses including GC content, nucleotide frequency, 
 sequence translation, and analysis plots.
 """
+import hashlib
 import logging
-import os
+from concurrent.futures import ThreadPoolExecutor
 
-from flask import Blueprint, render_template, request, session
+from flask import Blueprint, abort, make_response, render_template, request, session
+from sqlalchemy.orm import load_only
 from werkzeug.utils import secure_filename
 
 from FASTAflow.config import Config
@@ -18,6 +20,14 @@ from FASTAflow.modules.models import db, FastaEntry
 
 bp = Blueprint('pages', __name__)
 
+# Analyses of larger selections are spread over a thread pool, NumPy releases the GIL
+# while counting and translating. Smaller selections aren't worth the hand-off.
+PARALLEL_ANALYSIS_MIN = 4
+_analysis_pool = ThreadPoolExecutor(thread_name_prefix='analysis')
+
+# The plots served by plot_image, all of them are SVG images
+PLOT_KINDS = frozenset({'nuc', 'amino', 'gc'})
+
 def allowed_file(filename):
     """
     Check if a file has an allowed extension.
@@ -32,7 +42,8 @@ def allowed_file(filename):
     :returns: A boolean value indicating whether the given file extension
         is allowed or not.
     """
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
+    dot = filename.rfind('.')
+    return dot != -1 and filename[dot + 1:].lower() in Config.ALLOWED_EXTENSIONS
 
 
 @bp.route('/')
@@ -69,67 +80,57 @@ def import_fasta():
 def handle_upload():
     """
     Handles the upload of a FASTA file via a POST request. Validates the request,
-    processes the uploaded file, and parses its contents to store in the database.
+    parses the uploaded file straight from the request stream and stores its
+    contents in the database.
 
     :returns: An HTML page rendered with results or error messages depending on 
         the success or failure of the upload and processing.
 
+    :raises UnicodeDecodeError: If the file contains non-ASCII sequence characters
+        or a header that isn't UTF-8, answered with a 400 error.
     :raises ValueError: If the file processing encounters invalid data or fails
         to extract any sequences.
-    :raises IOError: If saving the uploaded file to disk fails due to I/O issues.
     :raises Exception: For unexpected errors during file processing.
     """
+    # Clear the session for new uploads
+    session.clear()
+
+    # Make sure the request is correct and a correct file is uploaded
+    if 'fastaFile' not in request.files:
+        return render_template('error.html',
+                               error='The FASTA file was not found in the request')
+    file = request.files['fastaFile']
+    if not file.filename:
+        return render_template('error.html',
+                               error='No file selected for upload, please choose a file before proceeding')
+    if not allowed_file(file.filename):
+        return render_template('error.html',
+                               error=f'Invalid file type: {file.filename}, please choose a FASTA file')
+
+    # Reads the uploaded file in memory and stores the attributes in the database
     try:
-        # Clear the session for new uploads
-        session.clear()
+        entries = read_fasta.store_fasta_in_db(file.stream, secure_filename(file.filename))
 
-        # Make sure the request is correct and a correct file is uploaded
-        if 'fastaFile' not in request.files:
-            return render_template('error.html',
-                                   error='The FASTA file was not found in the request')
-        file = request.files['fastaFile']
-        if not file.filename:
-            return render_template('error.html',
-                                   error='No file selected for upload, please choose a file before proceeding')
-        if not allowed_file(file.filename):
+        if not entries:
             return render_template('error.html',
-                                   error=f'Invalid file type: {file.filename}, please choose a FASTA file')
-
-        # Create temporary file for processing
-        filename = secure_filename(file.filename)
-        fasta_filepath = os.path.join('temp', filename)
-        os.makedirs('temp', exist_ok=True)
-
-        # Saves the file in the temp folder
-        try:
-            file.save(fasta_filepath)
-        except IOError as e:
-            logging.error(f'Failed to save the uploaded file: {e}')
-            return render_template('error.html',
-                                   error='Failed to save the uploaded file, please try again'), 500
-
-        # Reads the files and stores the attributes in the database
-        try:
-            entries = read_fasta.store_fasta_in_db(fasta_filepath)
-            os.remove(fasta_filepath)
-
-            if not entries:
-                return render_template('error.html',
-                                       error='No sequences were found in the file'), 400
-
-            return render_template('choose_seq.html', entries=entries)
-        except ValueError as e:
-            logging.error(f'Failed to process the uploaded file: {e}')
-            return render_template('error.html',
-                                   error='Failed to process the uploaded file, please try again'), 500
-        except Exception as e:
-            logging.error(f'An unexpected error occurred: {e}')
-            return render_template('error.html',
-                                   error='An unexpected error occurred, please try again'), 500
-    # Always removes the file from the temp directory
-    finally:
-        if 'fastaFile' in locals() and os.path.exists(fasta_filepath):
-            os.remove(fasta_filepath)
+                                   error='No sequences were found in the file'), 400
+
+        return render_template('choose_seq.html', entries=entries)
+    except UnicodeDecodeError as e:
+        logging.warning(f'Rejected an uploaded file with undecodable characters: {e}')
+        if e.encoding == 'ascii':
+            error = 'The file contains non-ASCII sequence characters, sequences may only contain ASCII characters'
+        else:
+            error = 'The file contains a header that is not valid UTF-8 text'
+        return render_template('error.html', error=error), 400
+    except ValueError as e:
+        logging.error(f'Failed to process the uploaded file: {e}')
+        return render_template('error.html',
+                               error='Failed to process the uploaded file, please try again'), 500
+    except Exception as e:
+        logging.error(f'An unexpected error occurred: {e}')
+        return render_template('error.html',
+                               error='An unexpected error occurred, please try again'), 500
 
 
 @bp.route('/result', methods=['POST', 'GET'])
@@ -154,55 +155,101 @@ def result():
             return render_template('error.html',
                                    error='No sequences were selected, please select at least one sequence')
 
-        entries = db.session.query(FastaEntry).filter(FastaEntry.id.in_(selected_sequences)).all()
+        # Only the sequences are needed for the analysis, so no full entries are loaded here
+        sequences = db.session.query(FastaEntry.id, FastaEntry.sequence).filter(
+            FastaEntry.id.in_(selected_sequences)).all()
 
-        # Run al the analysis per sequence
-        for entry in entries:
-            seq = entry.sequence
+        # Run al the analysis per sequence and write them back in one batched UPDATE
+        run = _analysis_pool.map if len(sequences) >= PARALLEL_ANALYSIS_MIN else map
+        analyses = run(results.analyze_sequence, [sequence for _, sequence in sequences])
 
-            entry.gc_content = results.calculate_gc_content(seq)
-            entry.nuc_freq = results.calculate_nucleotide_frequency(seq)
-            entry.sequence_length = len(seq)
-            entry.protein_seq = results.translate_to_protein(seq)
+        updates = []
+        for (entry_id, _), analysis in zip(sequences, analyses):
+            gc_content, nuc_freq, sequence_length, protein_seq, amino_freq = analysis
 
+            updates.append({
+                'id': entry_id,
+                'gc_content': gc_content,
+                'nuc_freq': nuc_freq,
+                'sequence_length': sequence_length,
+                'protein_seq': protein_seq,
+                'amino_freq': amino_freq,
+            })
+
+        db.session.bulk_update_mappings(FastaEntry, updates)
         db.session.commit()
     else:
         selected_sequences = session.get('selected_sequences')
-        entries = db.session.query(FastaEntry).filter(FastaEntry.id.in_(selected_sequences)).all()
+
+    # The results page doesn't show the sequences or frequencies, so those columns are not loaded
+    entries = db.session.query(FastaEntry).options(
+        load_only(FastaEntry.id, FastaEntry.description, FastaEntry.gc_content,
+                  FastaEntry.sequence_length, FastaEntry.protein_seq)
+    ).filter(FastaEntry.id.in_(selected_sequences)).all()
 
     return render_template('results.html', entries=entries)
 
 
-@bp.route('/plots/<header>')
-def generate_plots(header):
+@bp.route('/plots/<entry_id>')
+def generate_plots(entry_id):
     """
-    Generates and returns various plots for a given database entry based on the
-    provided header. The function retrieves the entry from the database, computes
-    nucleotide and amino acid frequencies, and creates corresponding visualizations
-    for rendering on a web page. The generated plots include a pie chart for
-    nucleotide frequencies, a bar chart for amino acid frequencies, and a GC-content
-    plot.
-
-    :param header: The sequence header used to query the database for a
-        corresponding `FastaEntry`.
-    :type header: str
-    :return: Rendered HTML template displaying the generated plots for the given
-        `header`.
+    Renders the plots page for a given database entry based on the provided id. The
+    page shows a pie chart for nucleotide frequencies, a bar chart for amino acid
+    frequencies, and a GC-content plot. The plots themselves are served by
+    `plot_image`, so the browser can load and cache them separately from the page.
+
+    :param entry_id: The sequence id used to look up the corresponding `FastaEntry`
+        by its primary key.
+    :type entry_id: str
+    :return: Rendered HTML template displaying the plots for the given entry.
     """
-    # Get the entry in the database based on the header
-    entry = db.session.query(FastaEntry).filter_by(description=header).first()
+    # Get the entry in the database based on its id, the plots need its analysis results
+    entry = db.session.get(FastaEntry, entry_id)
+    if entry is None or entry.nuc_freq is None:
+        return render_template('error.html',
+                               error='The requested sequence was not found, please analyze it first'), 404
 
-    nuc_freq = entry.nuc_freq
-    sequence = entry.sequence
-    amino_freq = results.amino_acids_frequencies(entry.protein_seq)
+    return render_template('plots.html', header=entry.description, entry_id=entry.id)
 
-    # Creates the plots shown on the page
-    nuc_freq_plot = plots.pie_plot(header, nuc_freq)
-    amino_freq_plot = plots.bar_plot(header, amino_freq)
-    gc_content_plot = plots.gc_plot(header, sequence)
 
-    return render_template('plots.html',
-                           header=header,
-                           pie_plot=nuc_freq_plot,
-                           bar_plot=amino_freq_plot,
-                           gc_plot=gc_content_plot)
+@bp.route('/plots/<entry_id>/<kind>')
+def plot_image(entry_id, kind):
+    """
+    Serves one plot of a database entry as an image. The plot is rendered on the
+    first request and cached afterward. The browser may keep the response but has to
+    revalidate it with its ETag, which is answered with an empty 304 response while
+    the plot is unchanged.
+
+    :param entry_id: The sequence id used to look up the corresponding `FastaEntry`
+        by its primary key.
+    :type entry_id: str
+    :param kind: The plot to serve, 'nuc' for the nucleotide frequency pie chart,
+        'amino' for the amino acid frequency bar chart or 'gc' for the GC-content plot.
+    :type kind: str
+    :return: The image response, or a 404 error for an unknown entry or plot, or for
+        a chart of an entry that is not analyzed yet.
+    """
+    entry = db.session.get(FastaEntry, entry_id)
+    if entry is None or kind not in PLOT_KINDS:
+        abort(404)
+
+    # The frequencies only exist once the entry is analyzed, a chart rendered before that
+    # would be empty and stay cached under the same key as the real one
+    if kind != 'gc' and entry.nuc_freq is None:
+        abort(404)
+
+    header = entry.description
+    renderers = {
+        'nuc': lambda: plots.pie_plot(header, entry.nuc_freq),
+        'amino': lambda: plots.bar_plot(header, entry.amino_freq),
+        'gc': lambda: plots.gc_plot(header, entry.sequence),
+    }
+    image = plots.cached_plot(kind, header, entry.sequence, renderers[kind])
+
+    response = make_response(image)
+    response.mimetype = 'image/svg+xml'
+    # The image URL doesn't encode the content, so the browser revalidates it with the ETag on every use
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    response.set_etag(hashlib.blake2b(image, digest_size=16).hexdigest())
+    return response.make_conditional(request)
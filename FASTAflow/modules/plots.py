@@ -5,17 +5,62 @@ Functions:
 - pie_plot: Generates a pie chart for nucleotide frequencies.
 - bar_plot: Creates a bar chart for amino acid frequencies.
 - gc_plot: Produces a line plot for GC content across a given sequence.
+- cached_plot: Returns a plot for a sequence, reusing an earlier render of the same sequence.
+
+All plots are returned as SVG image bytes, so they can be served as images of their own. The pie
+and bar charts are rendered by matplotlib, while the GC content line plot is written directly.
 """
-import matplotlib
-import base64
+import hashlib
 import io
-import matplotlib.pyplot as plt
+import math
+import threading
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Set global font size for all plots, and keep text as text in SVG output instead of drawing every glyph
+matplotlib.rcParams.update({'font.size': 20, 'svg.fonttype': 'none'})
+
+# Figures and the image buffer are reused per thread instead of going through pyplot,
+# which keeps global figure state and creates a new figure for every plot
+_thread_local = threading.local()
+
+# The gc plot is 2400 pixels wide, so drawing more points than this adds nothing
+MAX_GC_POINTS = 2000
+
+# Maps every byte value to 1 for G and C bases and to 0 for anything else
+_GC_LOOKUP = np.zeros(256, dtype=np.uint8)
+_GC_LOOKUP[list(b'GCgc')] = 1
+
+# Size and left, right, top and bottom margins of the gc plot, matching a 24 by 6 inch figure at 100 dpi
+_GC_SVG_SIZE = (2400, 600)
+_GC_SVG_MARGINS = (140, 40, 90, 110)
+
+# Rendered plots keyed by plot kind, header and sequence hash, the least recently used are
+# dropped first. This holds the three plots of 64 sequences.
+PLOT_CACHE_SIZE = 192
+_plot_cache = OrderedDict()
+_plot_cache_lock = threading.Lock()
 
-# Set global font size for all plots
-plt.rcParams.update({'font.size': 20})
 
-# Set a matplotlib backend
-matplotlib.use('Agg')
+def _get_figure(figsize):
+    """Returns a cleared figure of the given size and a new axes on it, cached per thread."""
+    if not hasattr(_thread_local, 'figures'):
+        _thread_local.figures = {}
+
+    fig = _thread_local.figures.get(figsize)
+    if fig is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        _thread_local.figures[figsize] = fig
+
+    fig.clf()
+    return fig, fig.add_subplot()
+
 
 def _set_plot_styling(ax, title):
     """Sets the common styling for all plots."""
@@ -27,47 +72,48 @@ def _set_plot_styling(ax, title):
     ax.spines['right'].set_color('white')
 
 
-def _plot_to_base64(fig):
-    """Converts a matplotlib figure to a base64-encoded PNG image."""
-    img = io.BytesIO()
-    fig.savefig(img, format='png', transparent=True, dpi=100)
+def _plot_to_svg(fig):
+    """Converts a matplotlib figure to SVG image bytes."""
+    if not hasattr(_thread_local, 'buffer'):
+        _thread_local.buffer = io.BytesIO()
+
+    img = _thread_local.buffer
     img.seek(0)
-    plot_url = base64.b64encode(img.read()).decode()
-    plt.close(fig)
-    return f'data:image/png;base64,{plot_url}'
+    img.truncate()
+    fig.savefig(img, format='svg', transparent=True)
+    return img.getvalue()
 
 def pie_plot(header, nuc_freq):
     """
     Generates a pie chart visualization for nucleotide frequencies annotated with percentages. The chart represents
     the distribution of nucleotide frequencies and is titled with the provided header.
 
-    The function saves the plot into a transparent PNG image file, encodes it in base64, and returns the encoded
-    string suitable for embedding in HTML or other formats that support base64 encoded images.
+    The function saves the plot into a transparent SVG image and returns its bytes, suitable for serving
+    directly as an image response. A vector image skips rasterizing and compressing the whole figure.
 
     :param header: The title for the pie chart, typically describing the context of the nucleotide frequencies.
     :type header: str
     :param nuc_freq: A dictionary where keys are nucleotide characters (e.g., 'A', 'C', 'G', 'T') and values are
         their respective frequencies.
     :type nuc_freq: dict
-    :return: A base64 encoded representation of the generated pie chart as a PNG image.
-    :rtype: str
+    :return: The generated pie chart as SVG image bytes.
+    :rtype: bytes
     """
-    fig, ax = plt.subplots(figsize=(12, 7.5))
-    nucleotides = list(nuc_freq.keys())
-    frequencies = list(nuc_freq.values())
+    fig, ax = _get_figure((12, 7.5))
+    nucleotides, frequencies = zip(*nuc_freq.items()) if nuc_freq else ((), ())
 
     ax.pie(frequencies, labels=nucleotides, autopct='%1.1f%%')
     _set_plot_styling(ax, f'Nucleotide Frequencies for {header}')
 
-    return _plot_to_base64(fig)
+    return _plot_to_svg(fig)
 
 def bar_plot(header, amino_freq):
     """
     Generates a bar plot representing amino acid frequencies using the provided
     header and amino frequency data. This function creates a visually appealing
-    bar plot with custom formatting and returns the plot as a base64-encoded
-    image in the PNG format. This enables embedding the plot in web-based
-    interfaces or other platforms requiring a base64 image string.
+    bar plot with custom formatting and returns the plot as an image in the
+    SVG format. This enables serving the plot directly to web-based interfaces
+    as an image of its own.
 
     :param header: The header text displayed in the title of the plot. Typically,
         this could be a descriptive label or identifier related to the data being
@@ -76,29 +122,36 @@ def bar_plot(header, amino_freq):
     :param amino_freq: A dictionary where keys represent amino acid names or
         symbols, and values are their corresponding frequencies (in percentage).
     :type amino_freq: dict[str, float]
-    :return: A string containing the base64-encoded representation of the generated
-        PNG image. The image string can be used to display the plot in
-        applications requiring inline image rendering.
-    :rtype: str
+    :return: The bytes of the generated SVG image.
+    :rtype: bytes
     """
     # Create the bar plot
-    fig, ax = plt.subplots(figsize=(12, 7.5))
-    amino_acids = list(amino_freq.keys())
-    frequencies = list(amino_freq.values())
+    fig, ax = _get_figure((12, 7.5))
+    amino_acids, frequencies = zip(*amino_freq.items()) if amino_freq else ((), ())
 
     ax.bar(amino_acids, frequencies)
     ax.set_ylabel('Frequency (%)', color='white')
     ax.set_xlabel('Nucleotides', color='white')
     _set_plot_styling(ax, f'Amino acid frequencies for {header}')
 
-    return _plot_to_base64(fig)
+    return _plot_to_svg(fig)
+
+def _tick_step(span, max_ticks=8):
+    """Returns a round distance between axis ticks that fits at most max_ticks ticks in the span."""
+    raw_step = span / max_ticks
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    for factor in (1, 2, 5, 10):
+        if factor * magnitude >= raw_step:
+            return factor * magnitude
+
 
 def gc_plot(header, sequence):
     """
     Generates a GC content plot for a given DNA sequence. The function calculates the
     cumulative GC content at each position in the sequence and produces a line plot
-    to visualize the GC content evolution across the sequence. The generated plot
-    is returned as a base64-encoded PNG image.
+    to visualize the GC content evolution across the sequence. The plot is written
+    directly as an SVG image with the line as a single polyline, which avoids the
+    figure setup and rasterization of matplotlib for what is just one line.
 
     :param header: The header or identifier for the DNA sequence. Used as the title
                    of the plot.
@@ -107,22 +160,92 @@ def gc_plot(header, sequence):
                      and plotted. The sequence is expected to be a string containing
                      valid DNA nucleotides ('A', 'T', 'G', 'C', 'U').
     :type sequence: str
-    :return: A string containing the base64-encoded PNG image of the GC content plot.
-    :rtype: str
+    :return: The SVG image bytes of the GC content plot.
+    :rtype: bytes
+    """
+    # Only draw as many points as the image can show
+    seq_arr = np.frombuffer(sequence.encode('ascii'), dtype=np.uint8)
+    step = max(1, seq_arr.size // MAX_GC_POINTS)
+    positions = np.arange(0, seq_arr.size, step)
+
+    # Count the GC bases up to every position in a single pass, and only turn the drawn points into percentages
+    gc_counts = np.cumsum(_GC_LOOKUP[seq_arr], dtype=np.int64)
+    values = gc_counts[positions] * 100 / (positions + 1)
+
+    # Round the axis limits to whole ticks around the data
+    x_max = max(seq_arr.size - 1, 1)
+    x_step = max(_tick_step(x_max), 1)
+    y_low, y_high = (values.min(), values.max()) if values.size else (0.0, 100.0)
+    y_step = _tick_step(max(y_high - y_low, 1.0))
+    y_min = math.floor(y_low / y_step) * y_step
+    y_max = max(math.ceil(y_high / y_step) * y_step, y_min + y_step)
+
+    # Map the data onto the plot area of the image
+    width, height = _GC_SVG_SIZE
+    left, right, top, bottom = _GC_SVG_MARGINS
+    plot_width = width - left - right
+    plot_height = height - top - bottom
+    xs = left + positions / x_max * plot_width
+    ys = top + (y_max - values) / (y_max - y_min) * plot_height
+
+    svg = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'font-family="DejaVu Sans, sans-serif" font-size="28" fill="white">',
+        f'<text x="{left + plot_width / 2}" y="{top - 30}" text-anchor="middle">GC content for {escape(header)}</text>',
+        f'<text x="{left + plot_width / 2}" y="{height - 15}" text-anchor="middle">Position in sequence</text>',
+        f'<text transform="translate(35 {top + plot_height / 2}) rotate(-90)" text-anchor="middle">'
+        f'GC content (%)</text>',
+    ]
+
+    for x in np.arange(0, x_max + 1, x_step):
+        x_pixel = left + x / x_max * plot_width
+        svg.append(f'<line x1="{x_pixel:.1f}" y1="{top + plot_height}" x2="{x_pixel:.1f}" '
+                   f'y2="{top + plot_height + 10}" stroke="white"/>')
+        svg.append(f'<text x="{x_pixel:.1f}" y="{top + plot_height + 45}" text-anchor="middle">{int(x)}</text>')
+
+    for y in np.arange(y_min, y_max + y_step / 2, y_step):
+        y_pixel = top + (y_max - y) / (y_max - y_min) * plot_height
+        svg.append(f'<line x1="{left - 10}" y1="{y_pixel:.1f}" x2="{left}" y2="{y_pixel:.1f}" stroke="white"/>')
+        svg.append(f'<text x="{left - 18}" y="{y_pixel + 10:.1f}" text-anchor="end">{y:g}</text>')
+
+    points = ' '.join(f'{x:.1f},{y:.1f}' for x, y in zip(xs.tolist(), ys.tolist()))
+    svg.append(f'<polyline points="{points}" fill="none" stroke="#1f77b4" stroke-width="2"/>')
+    svg.append(f'<rect x="{left}" y="{top}" width="{plot_width}" height="{plot_height}" '
+               f'fill="none" stroke="white"/>')
+    svg.append('</svg>')
+
+    return '\n'.join(svg).encode('utf-8')
+
+
+def cached_plot(kind, header, sequence, render):
+    """
+    Returns a plot of a sequence, rendering it only when it is not cached yet. Renders are
+    cached under the plot kind, the header and a hash of the sequence, which turns a
+    repeated request for the same plot into a dictionary lookup. The render function may
+    therefore only use the sequence and results derived from it, like the frequencies of
+    an analyzed entry, never placeholders for results that are still missing.
+
+    :param kind: The kind of plot, like 'nuc', 'amino' or 'gc'.
+    :type kind: str
+    :param header: The header of the sequence, used in the plot titles.
+    :type header: str
+    :param sequence: The DNA sequence the plot is made for.
+    :type sequence: str
+    :param render: A function without arguments that renders the plot on a cache miss.
+    :type render: Callable[[], bytes]
+    :return: The image bytes of the plot.
+    :rtype: bytes
     """
-    # Calculate gc_content at each position
-    gc_content = []
-    for i in range(1, len(sequence) + 1):
-            gc_count = sequence[:i].count('G') + sequence[:i].count('C')
-            gc_content.append(gc_count / i * 100)
-
-    # Create line plot
-    fig, ax = plt.subplots(figsize=(24, 6))
-    ax.plot(gc_content)
-
-    ax.set_title(f'GC content for {header}', wrap=True, color='white', pad=20)
-    ax.set_ylabel('GC content (%)', color='white')
-    ax.set_xlabel('Position in sequence', color='white')
-    _set_plot_styling(ax, f'GC content for {header}')
-
-    return _plot_to_base64(fig)
\ No newline at end of file
+    key = (kind, header, hashlib.blake2b(sequence.encode('ascii'), digest_size=16).digest())
+    with _plot_cache_lock:
+        if key in _plot_cache:
+            _plot_cache.move_to_end(key)
+            return _plot_cache[key]
+
+    image = render()
+
+    with _plot_cache_lock:
+        _plot_cache[key] = image
+        if len(_plot_cache) > PLOT_CACHE_SIZE:
+            _plot_cache.popitem(last=False)
+    return image
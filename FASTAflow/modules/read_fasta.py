@@ -1,28 +1,88 @@
 """
 This module provides functionality for reading and storing sequences from FASTA files into a database.
 
-It uses Biopython for parsing FASTA files and SQLAlchemy for interacting with the database.
-Sequences that are already in the database are not duplicated, while new sequences are added.
-Error handling is implemented for file I/O and database operations.
+FASTA files are parsed in a single pass over their raw bytes and SQLAlchemy is used for interacting
+with the database. Sequences that are already in the database are not duplicated, while new sequences
+are added. Error handling is implemented for file I/O and database operations.
 """
-from Bio import SeqIO
 import logging
+import numpy as np
 from sqlalchemy.exc import SQLAlchemyError
 
 from FASTAflow.modules.models import db, FastaEntry
 
+# Bytes removed from the sequence bodies, the line breaks and any whitespace padding the lines
+_SEQUENCE_DELETE = b' \t\r\n'
 
-def store_fasta_in_db(filepath):
+
+def _record_bounds(data):
+    """
+    Locates the records in the raw bytes of a FASTA file.
+
+    The buffer is viewed as a uint8 array, so the search for '>' and newline bytes runs as
+    vectorized NumPy comparisons instead of a Python loop over the lines. Only a '>' at the
+    start of a line marks a new record.
+
+    :param data: The contents of a FASTA file.
+    :type data: bytes
+    :return: The offsets of every record start and of the end of its header line.
+    :rtype: tuple[list[int], list[int]]
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    starts = np.flatnonzero(arr == ord('>'))
+    starts = starts[(starts == 0) | (arr[starts - 1] == ord('\n'))]
+
+    # The header line of each record ends at the first newline after its '>'
+    newlines = np.append(np.flatnonzero(arr == ord('\n')), len(data))
+    header_ends = newlines[np.searchsorted(newlines, starts)]
+    return starts.tolist(), header_ends.tolist()
+
+
+def parse_fasta(data):
+    """
+    Parses the raw bytes of a FASTA file into its records.
+
+    Instead of looping over every line in Python, the record boundaries are located in
+    one vectorized scan over the whole buffer. Each record is then sliced into its header
+    line and sequence body, and the line breaks and other whitespace are removed from the
+    body in a single bytes.translate call before it is decoded. Anything before the first
+    header is ignored, just like Biopython does.
+
+    :param data: The contents of a FASTA file.
+    :type data: bytes
+    :return: A generator yielding a ``(title, sequence)`` tuple for every record, where
+        the title is the header line without the leading '>'.
+    :rtype: Iterator[tuple[str, str]]
+    """
+    starts, header_ends = _record_bounds(data)
+    record_ends = starts[1:] + [len(data)]
+
+    for start, header_end, end in zip(starts, header_ends, record_ends):
+        header = data[start + 1:header_end]
+        body = data[header_end + 1:end]
+        yield header.rstrip().decode('utf-8'), body.translate(None, _SEQUENCE_DELETE).decode('ascii')
+
+
+def store_fasta_in_db(file_handle, filename):
     """
     Stores sequences from a given FASTA file into a database. If a sequence with the
     same identifier already exists in the database, it reuses the existing database
-    entry; otherwise, it creates a new entry for the sequence.
+    entry; otherwise, it creates a new entry for the sequence. The existing entries
+    are looked up with one query for the whole file instead of one per sequence.
 
-    :param filepath: The path to the FASTA file containing sequence information.
-    :type filepath: str
+    The file is read straight from the given binary file object, so an upload can be
+    parsed in memory without first writing it to disk.
+
+    :param file_handle: A binary file-like object containing the FASTA file, like the
+        stream of an uploaded file.
+    :type file_handle: BinaryIO
+    :param filename: The name of the FASTA file, stored with every new entry.
+    :type filename: str
     :return: A list of `FastaEntry` objects corresponding to the sequences stored
              into the database.
     :rtype: list[FastaEntry]
+    :raises UnicodeDecodeError: If a sequence contains non-ASCII characters or a
+                                header isn't valid UTF-8 text.
     :raises ValueError: If the FASTA file cannot be read or sequences cannot
                         be stored due to an error with the database or other
                         unexpected issues.
@@ -30,28 +90,43 @@ def store_fasta_in_db(filepath):
     entries = []
     
     try:
-        with open(filepath, 'r') as file_handle:
-            for record in SeqIO.parse(file_handle, 'fasta'):
-                # Check if sequence id is already in the database
-                entry = db.session.query(FastaEntry).filter_by(id=record.id).first()
-
-                if entry:
-                    logging.info(f'Sequence with ID {record.id} already exists in the database, using existing entry')
-                else:
-                    # Create new entry if it doesn't exist
-                    entry = FastaEntry(
-                        id=record.id,
-                        description=record.description,
-                        sequence=str(record.seq),
-                        filepath=filepath
-                    )
-                    db.session.add(entry)
-
-                entries.append(entry)
-    
+        data = file_handle.read()
+
+        # The sequence id is the first word of the header
+        records = [(title.split(maxsplit=1)[0] if title else '', title, sequence)
+                   for title, sequence in parse_fasta(data)]
+
+        # Look up which sequence ids are already in the database with a single query
+        known = {entry.id: entry for entry in db.session.query(FastaEntry).filter(
+            FastaEntry.id.in_({record_id for record_id, _, _ in records}))}
+
+        new_entries = []
+        for record_id, title, sequence in records:
+            entry = known.get(record_id)
+
+            if entry:
+                logging.info(f'Sequence with ID {record_id} already exists in the database, using existing entry')
+            else:
+                # Create new entry if it doesn't exist
+                entry = FastaEntry(
+                    id=record_id,
+                    description=title,
+                    sequence=sequence,
+                    filepath=filename
+                )
+                new_entries.append(entry)
+                known[record_id] = entry
+
+            entries.append(entry)
+
+        # Insert the new entries in one batch, without the unit of work bookkeeping of session.add
+        db.session.bulk_save_objects(new_entries)
         db.session.commit()
-        logging.info(f'Stored {len(entries)} sequences from {filepath} in the database')
+        logging.info(f'Stored {len(entries)} sequences from {filename} in the database')
         return entries
+    except UnicodeDecodeError:
+        # Characters that can't be decoded are invalid input, so the caller gets the original error
+        raise
     except IOError as e:
         raise ValueError(f'Failed to read the FASTA file: {e}')
     except SQLAlchemyError as e:
@@ -2,14 +2,70 @@
 This module provides utility functions for analyzing DNA and protein sequences. 
 
 It includes methods for calculating GC content, nucleotide frequency, and sequence length, as well as 
-translating a DNA sequence into a protein sequence and calculating amino acid frequencies.
+translating a DNA sequence into a protein sequence and calculating amino acid frequencies. The
+`analyze_sequence` function computes all of these for one sequence while reading it only once.
 """
 __author__ = 'Sam Nelen'
 __version__ = '2025.01.16'
 
-from Bio.SeqUtils import gc_fraction
+import numpy as np
 from Bio.Seq import Seq
 
+# Byte values that gc_fraction counts as GC, and the unambiguous bases it counts towards the length
+_GC_CODES = np.frombuffer(b'CGScgs', dtype=np.uint8)
+_GC_LENGTH_CODES = np.frombuffer(b'CGScgsATWUatwu', dtype=np.uint8)
+
+
+# The standard genetic code, indexed by codon with the bases numbered A=0, C=1, G=2 and T/U=3
+_CODON_TABLE = np.frombuffer(b'KNKNTTTTRSRSIIMIQHQHPPPPRRRRLLLLEDEDAAAAGGGGVVVV*Y*YSSSS*CWCLFLF', dtype=np.uint8)
+
+# The number of every base by byte value, anything that is not an unambiguous base maps to 4
+_BASE_CODES = np.full(256, 4, dtype=np.uint8)
+_BASE_CODES[list(b'Aa')] = 0
+_BASE_CODES[list(b'Cc')] = 1
+_BASE_CODES[list(b'Gg')] = 2
+_BASE_CODES[list(b'TtUu')] = 3
+
+
+def _sequence_bytes(sequence):
+    """Views the ASCII characters of a sequence as an array of byte values."""
+    return np.frombuffer(sequence.encode('ascii'), dtype=np.uint8)
+
+
+def _byte_counts(seq_bytes):
+    """Counts the occurrences of every byte value in the sequence in a single pass."""
+    return np.bincount(seq_bytes, minlength=256)
+
+
+def _translate_bytes(seq_bytes, sequence):
+    """Translates a sequence from its byte values, as described in translate_to_protein."""
+    bases = _BASE_CODES[seq_bytes]
+    codons = bases[:len(bases) // 3 * 3].reshape(-1, 3)
+
+    if not (codons == 4).any():
+        return _CODON_TABLE[codons[:, 0] * 16 + codons[:, 1] * 4 + codons[:, 2]].tobytes().decode('ascii')
+
+    # Use the Biopython translate function for ambiguous codons
+    try:
+        return str(Seq(sequence).translate())
+    except Exception as e:
+        print(f'Error translating sequence: {e}')
+        return '?' * (len(sequence)//3)
+
+
+def _gc_content_from_counts(counts):
+    """Calculates the GC content percentage from byte counts, the same way gc_fraction does."""
+    length = int(counts[_GC_LENGTH_CODES].sum())
+    if length == 0:
+        return 0.0
+    return round(int(counts[_GC_CODES].sum()) / length * 100, 2)
+
+
+def _character_frequency_from_counts(counts, seq_len):
+    """Calculates the percentage of every character that occurs in the sequence from byte counts."""
+    return {chr(code): round(int(counts[code]) / seq_len * 100, 2) for code in np.flatnonzero(counts)}
+
+
 def calculate_gc_content(sequence):
     """
     Calculate the GC content percentage of a given DNA sequence.
@@ -17,7 +73,8 @@ def calculate_gc_content(sequence):
     This function computes the percentage of guanine (G) and cytosine (C)
     bases in a DNA sequence. The GC content is an indicator of the
     molecular composition of the DNA. It returns 0.0 if the input
-    sequence is empty.
+    sequence is empty. Like Biopython's `gc_fraction`, ambiguous bases
+    are left out of the length the percentage is taken over.
 
     :param sequence: The DNA sequence for which the GC content is to be calculated.
     :type sequence: str
@@ -27,8 +84,8 @@ def calculate_gc_content(sequence):
     if not sequence:
         return 0.0 # Return 0 when sequence has no value
 
-    # Calculate the gc-content percentage
-    return round(gc_fraction(sequence) * 100, 2)
+    # Calculate the gc-content percentage from a single histogram pass
+    return _gc_content_from_counts(_byte_counts(_sequence_bytes(sequence)))
 
 
 def calculate_nucleotide_frequency(sequence):
@@ -36,7 +93,8 @@ def calculate_nucleotide_frequency(sequence):
     Calculates the frequency of each nucleotide in a given DNA sequence. The frequency
     is computed as the proportion of each nucleotide in the sequence and is returned
     as a percentage rounded to two decimal places. If the input sequence is empty,
-    an empty dictionary is returned.
+    an empty dictionary is returned. All nucleotides are counted at once with
+    `numpy.bincount` over the sequence bytes.
 
     :param sequence: The DNA sequence for which nucleotide frequency
                      needs to be calculated.
@@ -52,13 +110,8 @@ def calculate_nucleotide_frequency(sequence):
     if seq_len == 0:
         return {} # Return emtpy dictionary when length is 0
 
-    counts = {}
-    for nucleotide in sequence:
-        counts[nucleotide] = counts.get(nucleotide, 0) + 1
-
-    # Calculates the nucleotide frequencies percentages
-    frequencies = {nuc : round((count / seq_len) * 100, 2) for nuc, count in counts.items()}
-    return frequencies
+    # Counts all nucleotides in one histogram pass and calculates their percentages
+    return _character_frequency_from_counts(_byte_counts(_sequence_bytes(sequence)), seq_len)
 
 
 def translate_to_protein(sequence):
@@ -67,18 +120,18 @@ def translate_to_protein(sequence):
     using the standard genetic code. Returns '?' for each amino acid in case
     of an error during translation.
 
+    Sequences made up of only A, C, G and T/U are translated in one go by
+    numbering the bases, combining every three into a codon index and looking
+    all codons up in a 64-entry table. Sequences with ambiguous bases are left
+    to Biopython, which knows how to resolve them.
+
     :param sequence: A nucleotide sequence to be translated.
     :type sequence: str
     :return: The translated protein sequence or a sequence of '?' characters
              of the same length as possible amino acids if an error occurs.
     :rtype: str
     """
-    # Use the Biopython translate function
-    try:
-        return str(Seq(sequence).translate())
-    except Exception as e:
-        print(f'Error translating sequence: {e}')
-        return '?' * (len(sequence)//3)
+    return _translate_bytes(_sequence_bytes(sequence), sequence)
 
 
 def amino_acids_frequencies(protein_seq):
@@ -96,19 +149,38 @@ def amino_acids_frequencies(protein_seq):
         frequencies in percentage.
     :rtype: dict
     """
-    amino_counts = {}
-
-    for amino in protein_seq:
-        amino_counts[amino] = amino_counts.get(amino, 0) + 1
-
-    # Calculates the amino acid frequencies in percentages
-    frequencies = {amino : round(count / len(protein_seq) * 100, 2) for amino, count in amino_counts.items()}
-    return frequencies
-
-
-
-
-
+    if not protein_seq:
+        return {}
 
+    # Count every amino acid in a single histogram pass, the same way as the nucleotides
+    return _character_frequency_from_counts(_byte_counts(_sequence_bytes(protein_seq)), len(protein_seq))
 
 
+def analyze_sequence(sequence):
+    """
+    Runs all the sequence analyses in one go. The sequence is converted to a byte array
+    once and shared by all analyses. Its bytes are counted with a single histogram pass,
+    and the GC content, nucleotide frequencies and length are all derived from those
+    counts instead of walking the sequence for every analysis. The translation reuses
+    the same byte array, and its amino acid frequencies are calculated right away so
+    they can be stored with the other results.
+
+    :param sequence: The DNA sequence to analyze.
+    :type sequence: str
+    :return: The GC content percentage, the nucleotide frequencies in percentages, the
+        sequence length, the translated protein sequence and the amino acid frequencies
+        in percentages.
+    :rtype: tuple[float, dict, int, str, dict]
+    """
+    seq_len = len(sequence)
+    if seq_len == 0:
+        return 0.0, {}, 0, '', {}
+
+    seq_bytes = _sequence_bytes(sequence)
+    counts = _byte_counts(seq_bytes)
+    protein_seq = _translate_bytes(seq_bytes, sequence)
+    return (_gc_content_from_counts(counts),
+            _character_frequency_from_counts(counts, seq_len),
+            seq_len,
+            protein_seq,
+            amino_acids_frequencies(protein_seq))
@@ -0,0 +1,47 @@
+"""Store frequencies as JSON and add amino_freq
+
+Revision ID: 073d34ea7f58
+Revises: 5592cbeb05cc
+Create Date: 2025-01-20 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '073d34ea7f58'
+down_revision = '5592cbeb05cc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Pickled values can't be read as JSON and would turn into invalid text when the table is
+    # copied, so they are cleared. They are calculated again when the entry is analyzed.
+    op.execute('UPDATE fasta_entry SET nuc_freq = NULL, codon_freq = NULL')
+    with op.batch_alter_table('fasta_entry', schema=None) as batch_op:
+        batch_op.alter_column('nuc_freq',
+               existing_type=sa.PickleType(),
+               type_=sa.Text(),
+               existing_nullable=True)
+        batch_op.alter_column('codon_freq',
+               existing_type=sa.PickleType(),
+               type_=sa.Text(),
+               existing_nullable=True)
+        batch_op.add_column(sa.Column('amino_freq', sa.Text(), nullable=True))
+
+
+def downgrade():
+    # The JSON values can't be unpickled, so they are cleared instead of converted
+    op.execute('UPDATE fasta_entry SET nuc_freq = NULL, codon_freq = NULL')
+    with op.batch_alter_table('fasta_entry', schema=None) as batch_op:
+        batch_op.drop_column('amino_freq')
+        batch_op.alter_column('codon_freq',
+               existing_type=sa.Text(),
+               type_=sa.PickleType(),
+               existing_nullable=True)
+        batch_op.alter_column('nuc_freq',
+               existing_type=sa.Text(),
+               type_=sa.PickleType(),
+               existing_nullable=True)
@@ -0,0 +1,36 @@
+"""Initial schema
+
+Revision ID: 5592cbeb05cc
+Revises: 
+Create Date: 2025-01-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5592cbeb05cc'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('fasta_entry',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('sequence', sa.Text(), nullable=False),
+    sa.Column('filepath', sa.String(length=500), nullable=False),
+    sa.Column('sequence_length', sa.Integer(), nullable=True),
+    sa.Column('gc_content', sa.Float(), nullable=True),
+    sa.Column('nuc_freq', sa.PickleType(), nullable=True),
+    sa.Column('codon_freq', sa.PickleType(), nullable=True),
+    sa.Column('protein_seq', sa.Text(), nullable=True),
+    sa.Column('upload_date', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('fasta_entry')